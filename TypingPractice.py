@@ -1,9 +1,21 @@
 import urwid
+try:
+    from urwid.display import raw as raw_display
+except ImportError:  # urwid < 2.2
+    from urwid import raw_display
 import random
 import string
 import time
+import os
+import json
+import getpass
+from datetime import datetime
 
 str_vkey_tip = "Virtual Keyboard"
+str_session_dir = "sessions"
+
+def mean_ms(total_ns, count):
+    return round(total_ns / count / 1e6, 3) if count else None
 
 class Key:
     def __init__(self, display_text, char, key_positions, highlight_color='keyboard', name=None, zhuyin_char=None):
@@ -32,6 +44,37 @@ class Key:
         self.highlight_color = style
         self.widget.set_attr_map({None: style})
 
+# Raw display that stamps keys with a monotonic ns clock as soon as they are read from the terminal fd
+class TimestampedScreen(raw_display.Screen):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_ns = None      # Stamp of the most recent read
+        self.key_read_ns = None  # Stamp of the read whose keys are being dispatched right now
+
+    def get_available_raw_input(self):
+        codes = super().get_available_raw_input()
+        self.read_ns = time.monotonic_ns() if codes else None
+        return codes
+
+    def parse_input(self, event_loop, callback, codes, wait_for_more=True):
+        # The escape timeout calls back in with our own wrapper, which already holds the original stamp
+        if callback is None or getattr(callback, 'stamped', False):
+            return super().parse_input(event_loop, callback, codes, wait_for_more)
+
+        read_ns = self.read_ns
+
+        def stamped_callback(keys, raw):
+            # MainLoop dispatches the whole batch synchronously, so every key that
+            # reaches unhandled_input during this call came from this read
+            self.key_read_ns = read_ns
+            try:
+                return callback(keys, raw)
+            finally:
+                self.key_read_ns = None
+
+        stamped_callback.stamped = True
+        return super().parse_input(event_loop, stamped_callback, codes, wait_for_more)
+
 class TypingPractice:
     special_char_mapping = {
         '~': '`', '!': '1', '@': '2', '#': '3', '$': '4',
@@ -56,7 +99,10 @@ class TypingPractice:
         '-': 'ㄦ'
     }
 
-    def __init__(self):
+    def __init__(self, session_dir=str_session_dir):
+        self.session_dir = session_dir
+        self.session_start = time.time()  # Wall clock, only for started_at and the file name
+        self.session_start_mono = time.monotonic()  # Measures duration, immune to clock changes
         self.show_keyboard = True
         self.modes = ['english', 'zhuyin', 'mixed']
         self.mode = 'english'
@@ -100,6 +146,9 @@ class TypingPractice:
         self.current_char = self._generate_random_char()
         self.correct_count = 0
         self.total_count = 0
+        self.key_stats = {}  # Target character -> counts plus reaction/latency sums
+        self._reset_timing()
+        self.flash_alarm = None  # Pending alarm that ends the correct/wrong flash
 
         self.txt_target = urwid.Text([('bold', "Target Character: "), ('bold_target', f" {self.current_char} ")], align='center')
         self.txt_stats = urwid.Text(('bold', "Accuracy: 0% (0/0)"), align='center')
@@ -157,8 +206,10 @@ class TypingPractice:
         padded_pile = urwid.Padding(self.pile, align='center', width=('relative', 90))
         self.main_widget = urwid.Filler(padded_pile, 'middle')
 
+        self.screen = TimestampedScreen()
         self.loop = urwid.MainLoop(
             self.main_widget,
+            screen=self.screen,
             palette=[
                 ('bold', 'white,bold', 'default'),
                 ('bold_target', 'yellow,bold', 'dark blue'),
@@ -217,6 +268,14 @@ class TypingPractice:
     def set_mode(self, mode):
         if self.mode == mode:
             return
+
+        # Each mode is its own segment: close out the current one before its counters reset
+        self.export_summary()
+        if self.flash_alarm:
+            self.loop.remove_alarm(self.flash_alarm)
+            self.flash_alarm = None
+        self.session_start = time.time()
+        self.session_start_mono = time.monotonic()
             
         self.mode = mode
         
@@ -234,6 +293,8 @@ class TypingPractice:
         self.txt_target.set_text([('bold', "Target Character: "), ('bold_target', f" {self.current_char} ")])
         self.correct_count = 0
         self.total_count = 0
+        self.key_stats = {}
+        self._reset_timing()
         self.txt_stats.set_text(('bold', "Accuracy: 0% (0/0)"))
         
         if self.show_keyboard:
@@ -241,7 +302,49 @@ class TypingPractice:
             self._highlight_key(self.current_char)
             
         self.loop.draw_screen()
+        self.target_shown_ns = time.monotonic_ns()
         
+    def _reset_timing(self):
+        self.reaction_ns = 0      # Target shown -> key read from the terminal (human time)
+        self.reaction_count = 0
+        self.latency_ns = 0       # Key read from the terminal -> handle_input (program time)
+        self.latency_count = 0
+        self.unstamped_count = 0  # Keys that did not come through the raw display
+        self.early_count = 0      # Keys read before the current target was on screen
+        self.target_shown_ns = time.monotonic_ns()
+
+    def _record_timing(self, key_stats, key_ns, handled_ns):
+        if key_ns is None:
+            self.unstamped_count += 1
+            return
+
+        latency_ns = handled_ns - key_ns
+        self.latency_ns += latency_ns
+        self.latency_count += 1
+        key_stats['latency_ns'] += latency_ns
+        key_stats['latency_count'] += 1
+
+        # Typed during the previous flash or read in the same batch as the previous key
+        if key_ns < self.target_shown_ns:
+            self.early_count += 1
+            return
+
+        reaction_ns = key_ns - self.target_shown_ns
+        self.reaction_ns += reaction_ns
+        self.reaction_count += 1
+        key_stats['reaction_ns'] += reaction_ns
+        key_stats['reaction_count'] += 1
+
+    def _show_target(self, loop=None, user_data=None):
+        self.flash_alarm = None
+        self.txt_target.set_text([('bold', "Target Character: "), ('bold_target', f" {self.current_char} ")])
+        if self.show_keyboard:
+            self._highlight_key(self.current_char)
+
+        # Restart the clock only once the target is on screen, so the flash and redraw are not human time
+        self.loop.draw_screen()
+        self.target_shown_ns = time.monotonic_ns()
+
     def toggle_label_mode(self):
         current_index = self.label_modes.index(self.label_mode)
         next_index = (current_index + 1) % len(self.label_modes)
@@ -557,6 +660,9 @@ class TypingPractice:
                 )
 
     def handle_input(self, key):
+        handled_ns = time.monotonic_ns()
+        key_ns = self.screen.key_read_ns
+
         if key == 'esc':
             raise urwid.ExitMainLoop()
         
@@ -573,6 +679,11 @@ class TypingPractice:
             return
 
         if isinstance(key, str) and len(key) == 1:
+            if self.flash_alarm:
+                # Read during the flash: show the target now, which leaves this key stamped before it
+                self.loop.remove_alarm(self.flash_alarm)
+                self._show_target()
+
             self.total_count += 1
             if self.show_keyboard:
                 self._reset_keyboard_highlight()
@@ -595,6 +706,16 @@ class TypingPractice:
             else:
                 if key.lower() in self.zhuyin_mapping and self.zhuyin_mapping[key.lower()] == self.current_char:
                     is_correct = True
+
+            key_stats = self.key_stats.setdefault(self.current_char, {
+                'correct': 0, 'total': 0,
+                'reaction_ns': 0, 'reaction_count': 0,
+                'latency_ns': 0, 'latency_count': 0,
+            })
+            key_stats['total'] += 1
+            if is_correct:
+                key_stats['correct'] += 1
+            self._record_timing(key_stats, key_ns, handled_ns)
             
             if mapped_key in self.key_coordinates:
                 row_idx, col_idx = self.key_coordinates[mapped_key]
@@ -625,22 +746,15 @@ class TypingPractice:
             if is_correct:
                 self.correct_count += 1
                 self.txt_target.set_text([('bold', "Target Character: "), ('bold_correct', f" {self.current_char} "), ('bold_correct_text', " ✓ Correct")])
-                self.loop.draw_screen()
-                time.sleep(0.1)
                 self.current_char = self._generate_random_char()
-                self.txt_target.set_text([('bold', "Target Character: "), ('bold_target', f" {self.current_char} ")])
             else:
                 self.txt_target.set_text([('bold', "Target Character: "), ('bold_wrong', f" {self.current_char} "), ('bold_wrong_text', " ✗ Wrong")])
-                self.loop.draw_screen()
-                time.sleep(0.1)
-                self.txt_target.set_text([('bold', "Target Character: "), ('bold_target', f" {self.current_char} ")])
 
             accuracy = (self.correct_count / self.total_count) * 100
             self.txt_stats.set_text(('bold', f"Accuracy: {accuracy:.1f}% ({self.correct_count}/{self.total_count})"))
 
-            if self.show_keyboard:
-                self._highlight_key(self.current_char)
-
+            # Flash on an alarm rather than sleeping, so keys typed meanwhile are still read and stamped
+            self.flash_alarm = self.loop.set_alarm_in(0.1, self._show_target)
             self.loop.set_alarm_in(0.2, self._reset_keyboard_highlight)
 
         elif key in ['shift', 'enter', ' ']:
@@ -650,13 +764,54 @@ class TypingPractice:
             self.loop.draw_screen()
             self.loop.set_alarm_in(0.2, self._reset_keyboard_highlight)
 
+    def export_summary(self):
+        if not self.total_count:
+            return None
+
+        started = datetime.fromtimestamp(self.session_start)
+        accuracy = (self.correct_count / self.total_count) * 100
+        keys = {}
+        for char, stats in self.key_stats.items():
+            keys[char] = {
+                'correct': stats['correct'],
+                'total': stats['total'],
+                'reaction_ms': mean_ms(stats['reaction_ns'], stats['reaction_count']),
+                'latency_ms': mean_ms(stats['latency_ns'], stats['latency_count']),
+            }
+
+        summary = {
+            'user': getpass.getuser(),
+            'started_at': started.isoformat(timespec='seconds'),
+            'duration': round(time.monotonic() - self.session_start_mono, 3),
+            'mode': self.mode,
+            'correct_count': self.correct_count,
+            'total_count': self.total_count,
+            'accuracy': round(accuracy, 2),
+            'reaction_ms': mean_ms(self.reaction_ns, self.reaction_count),
+            'latency_ms': mean_ms(self.latency_ns, self.latency_count),
+            'unstamped_count': self.unstamped_count,
+            'early_count': self.early_count,
+            'keys': keys,
+        }
+
+        os.makedirs(self.session_dir, exist_ok=True)
+        filename = f"{summary['user']}_{started.strftime('%Y%m%d_%H%M%S_%f')}.json"
+        path = os.path.join(self.session_dir, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        return path
+
     def run(self):
         if self.show_keyboard:
             self._highlight_key(self.current_char)
+        # The first draw happens inside loop.run() on a zero-delay alarm; stamp after it
+        self.loop.set_alarm_in(0, self._show_target)
         try:
             self.loop.run()
         except KeyboardInterrupt:
             pass
+        finally:
+            self.export_summary()
 
 if __name__ == '__main__':
     app = TypingPractice()
@@ -0,0 +1,207 @@
+import argparse
+import csv
+import json
+import math
+import os
+from multiprocessing import Pool
+
+str_session_dir = "sessions"
+
+
+def iter_summary_files(paths):
+    # Walk lazily so the file list is never materialised in memory
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            for name in files:
+                if name.endswith('.json'):
+                    yield os.path.join(root, name)
+
+
+def iter_chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def is_count(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def is_tally(correct, total):
+    return is_count(correct) and is_count(total) and correct <= total
+
+
+def positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def load_summary(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            summary = json.load(f)
+        user = summary['user']
+        correct = summary['correct_count']
+        total = summary['total_count']
+        duration = summary['duration']
+        keys = summary.get('keys', {})
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    # Validate here so a malformed file is skipped in the worker instead of crashing the merge
+    if not isinstance(user, str) or not is_tally(correct, total):
+        return None
+    if isinstance(duration, bool) or not isinstance(duration, (int, float)) or not math.isfinite(duration) or duration < 0:
+        return None
+    if not isinstance(keys, dict):
+        return None
+    for tally in keys.values():
+        if not isinstance(tally, dict) or not is_tally(tally.get('correct', 0), tally.get('total', 0)):
+            return None
+
+    return user, correct, total, duration, keys
+
+
+def load_chunk(paths):
+    # Fold a whole chunk in the worker so only a small partial report travels back to the parent
+    report = Report()
+    for path in paths:
+        report.add(load_summary(path))
+    return report
+
+
+class Report:
+    def __init__(self):
+        self.users = {}  # User -> {'sessions', 'correct', 'total', 'duration'}
+        self.keys = {}   # Target character -> {'correct', 'total'}
+        self.skipped = 0
+
+    def add(self, result):
+        if result is None:
+            self.skipped += 1
+            return
+
+        user, correct, total, duration, keys = result
+        stats = self.users.setdefault(user, {'sessions': 0, 'correct': 0, 'total': 0, 'duration': 0.0})
+        stats['sessions'] += 1
+        stats['correct'] += correct
+        stats['total'] += total
+        stats['duration'] += duration
+
+        for char, tally in keys.items():
+            key_stats = self.keys.setdefault(char, {'correct': 0, 'total': 0})
+            key_stats['correct'] += tally.get('correct', 0)
+            key_stats['total'] += tally.get('total', 0)
+
+    def merge(self, other):
+        for user, other_stats in other.users.items():
+            stats = self.users.setdefault(user, {'sessions': 0, 'correct': 0, 'total': 0, 'duration': 0.0})
+            for field, value in other_stats.items():
+                stats[field] += value
+
+        for char, other_stats in other.keys.items():
+            key_stats = self.keys.setdefault(char, {'correct': 0, 'total': 0})
+            key_stats['correct'] += other_stats['correct']
+            key_stats['total'] += other_stats['total']
+
+        self.skipped += other.skipped
+
+    def leaderboard(self, min_attempts=1):
+        rows = []
+        for user, stats in self.users.items():
+            if stats['total'] < min_attempts:
+                continue
+            accuracy = (stats['correct'] / stats['total']) * 100 if stats['total'] else 0.0
+            minutes = stats['duration'] / 60
+            kpm = stats['total'] / minutes if minutes else 0.0
+            rows.append([user, stats['sessions'], stats['correct'], stats['total'],
+                         round(accuracy, 2), round(stats['duration'], 1), round(kpm, 1)])
+        rows.sort(key=lambda row: (-row[4], -row[3], row[0]))
+        return ['user', 'sessions', 'correct', 'total', 'accuracy', 'duration', 'keys_per_min'], rows
+
+    def trouble_spots(self, min_attempts=1):
+        rows = []
+        for char, stats in self.keys.items():
+            if stats['total'] < min_attempts:
+                continue
+            wrong = stats['total'] - stats['correct']
+            error_rate = (wrong / stats['total']) * 100
+            rows.append([char, wrong, stats['total'], round(error_rate, 2)])
+        rows.sort(key=lambda row: (-row[3], -row[2], row[0]))
+        return ['key', 'wrong', 'total', 'error_rate'], rows
+
+
+def build_report(paths, processes=None, chunksize=256):
+    report = Report()
+    chunks = iter_chunks(iter_summary_files(paths), chunksize)
+    processes = processes or os.cpu_count() or 1
+
+    # A single worker gains nothing from a pool but still pays for pickling
+    if processes == 1:
+        for chunk in chunks:
+            report.merge(load_chunk(chunk))
+        return report
+
+    with Pool(processes) as pool:
+        for partial in pool.imap_unordered(load_chunk, chunks):
+            report.merge(partial)
+    return report
+
+
+def write_table(path, header, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def print_table(title, header, rows, limit):
+    print(title)
+    print('  '.join(f"{h:>12}" for h in header))
+    for row in rows[:limit]:
+        print('  '.join(f"{str(v):>12}" for v in row))
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate exported TypingPractice session summaries.")
+    parser.add_argument('paths', nargs='*', default=[str_session_dir],
+                        help="Summary files or directories to scan (default: %(default)s)")
+    parser.add_argument('-o', '--output', default='.', help="Directory for the CSV tables")
+    parser.add_argument('-j', '--jobs', type=positive_int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--chunksize', type=positive_int, default=256, help="Files handed to a worker at a time")
+    parser.add_argument('--min-attempts', type=positive_int, default=20,
+                        help="Ignore users and keys with fewer keystrokes")
+    parser.add_argument('--top', type=positive_int, default=10, help="Rows to print per table")
+    args = parser.parse_args(argv)
+
+    report = build_report(args.paths, args.jobs, args.chunksize)
+
+    os.makedirs(args.output, exist_ok=True)
+    header, rows = report.leaderboard(args.min_attempts)
+    write_table(os.path.join(args.output, 'leaderboard.csv'), header, rows)
+    print_table("Leaderboard", header, rows, args.top)
+
+    header, rows = report.trouble_spots(args.min_attempts)
+    write_table(os.path.join(args.output, 'trouble_keys.csv'), header, rows)
+    print_table("Trouble Keys", header, rows, args.top)
+
+    if report.skipped:
+        print(f"Skipped {report.skipped} unreadable summary file(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,22 @@ import time
 
 # Mock MainLoop to avoid running the full UI loop
 class MockLoop:
+    def __init__(self, app=None, keys=()):
+        self.app = app
+        self.keys = keys  # (target, key) pairs typed by run()
+        self.alarms = []
     def draw_screen(self): pass
-    def set_alarm_in(self, sec, callback): pass
+    def set_alarm_in(self, sec, callback):
+        self.alarms.append(callback)
+        return callback
+    def remove_alarm(self, handle):
+        self.alarms.remove(handle)
+    def run(self):
+        # Type the scripted keys, then quit like Ctrl+C
+        for target, key in self.keys:
+            self.app.current_char = target
+            self.app.handle_input(key)
+        raise KeyboardInterrupt
 
 def test_crash():
     app = TypingPractice()
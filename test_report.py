@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+from TypingPractice import TypingPractice
+from test_crash import MockLoop
+from TypingReport import build_report, main
+
+def write_summary(directory, name, user, correct, total, keys):
+    summary = {
+        'user': user,
+        'started_at': '2026-01-01T09:00:00',
+        'duration': 60.0,
+        'mode': 'english',
+        'correct_count': correct,
+        'total_count': total,
+        'accuracy': (correct / total) * 100,
+        'keys': keys,
+    }
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        json.dump(summary, f)
+
+def test_report():
+    with tempfile.TemporaryDirectory() as directory:
+        write_summary(directory, 'alice_1.json', 'alice', 9, 10, {'a': {'correct': 9, 'total': 10}})
+        write_summary(directory, 'alice_2.json', 'alice', 5, 10, {'a': {'correct': 5, 'total': 10}})
+        write_summary(directory, 'bob_1.json', 'bob', 9, 10, {'ㄅ': {'correct': 9, 'total': 10}})
+        with open(os.path.join(directory, 'broken.json'), 'w') as f:
+            f.write('{')
+        write_summary(directory, 'dave_1.json', 'dave', 1, 1, {'z': {'correct': 1, 'total': 1}})
+        write_summary(directory, 'bad_tally.json', 'carol', 1, 10, {'a': 3})
+        write_summary(directory, 'bad_key.json', 'carol', 1, 10, {'a': {'correct': 5, 'total': 1}})
+        with open(os.path.join(directory, 'bad_count.json'), 'w') as f:
+            json.dump({'user': 'carol', 'correct_count': 'many', 'total_count': 10, 'duration': 60.0}, f)
+
+        report = build_report([directory], processes=2, chunksize=1)
+        serial = build_report([directory], processes=1, chunksize=2)
+
+    header, rows = report.leaderboard()
+    assert [row[0] for row in rows] == ['dave', 'bob', 'alice']
+
+    # A single lucky keystroke does not top the board once a minimum applies
+    header, rows = report.leaderboard(min_attempts=10)
+    assert [row[0] for row in rows] == ['bob', 'alice']
+    assert rows[1][1:4] == [2, 14, 20]
+    assert serial.leaderboard(min_attempts=10) == (header, rows)
+
+    header, rows = report.trouble_spots(min_attempts=10)
+    assert rows[0] == ['a', 6, 20, 30.0]
+    assert serial.trouble_spots(min_attempts=10) == (header, rows)
+    assert report.skipped == 4
+    assert serial.skipped == 4
+
+def test_report_arguments():
+    for argv in (['-j', '-1'], ['--chunksize', '0'], ['--min-attempts', 'x']):
+        try:
+            main(argv)
+        except SystemExit as e:
+            assert e.code == 2
+        else:
+            assert False, argv
+
+def test_export_summary():
+    with tempfile.TemporaryDirectory() as directory:
+        app = TypingPractice(session_dir=directory)
+        app.loop = MockLoop(app, [])
+        app.run()
+        assert os.listdir(directory) == []
+
+        app = TypingPractice(session_dir=directory)
+        app.loop = MockLoop(app, [('a', 'a'), ('b', 'c'), ('b', 'b')])
+        app.run()
+
+        files = os.listdir(directory)
+        assert len(files) == 1
+        assert files[0].endswith('.json')
+        with open(os.path.join(directory, files[0]), encoding='utf-8') as f:
+            summary = json.load(f)
+
+    assert summary['mode'] == 'english'
+    assert summary['correct_count'] == 2
+    assert summary['total_count'] == 3
+    assert summary['accuracy'] == 66.67
+    assert summary['duration'] >= 0
+    assert summary['keys']['a']['correct'] == 1
+    assert summary['keys']['a']['total'] == 1
+    assert summary['keys']['b']['correct'] == 1
+    assert summary['keys']['b']['total'] == 2
+    assert files[0].startswith(summary['user'] + '_')
+
+def test_export_summary_per_mode():
+    with tempfile.TemporaryDirectory() as directory:
+        app = TypingPractice(session_dir=directory)
+        app.loop = MockLoop(app, [])
+        app.current_char = 'a'
+        app.handle_input('a')
+        app.set_mode('zhuyin')
+        assert app.total_count == 0
+        app.current_char = 'ㄅ'
+        app.handle_input('1')
+        app.current_char = 'ㄅ'
+        app.handle_input('2')
+        app.export_summary()
+
+        summaries = []
+        for name in sorted(os.listdir(directory)):
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                summaries.append(json.load(f))
+
+    assert [(s['mode'], s['correct_count'], s['total_count']) for s in summaries] == [('english', 1, 1), ('zhuyin', 1, 2)]
+
+if __name__ == "__main__":
+    test_report()
+    test_report_arguments()
+    test_export_summary()
+    test_export_summary_per_mode()
+    print("Test finished successfully.")
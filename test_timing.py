@@ -0,0 +1,170 @@
+import json
+import os
+import tempfile
+import time
+import TypingPractice as practice_module
+from TypingPractice import TypingPractice, TimestampedScreen
+from test_crash import MockLoop
+
+MS = 1000000
+
+# Mock event loop that records alarms instead of scheduling them
+class MockEventLoop:
+    def __init__(self):
+        self.alarms = []
+    def alarm(self, seconds, callback):
+        self.alarms.append(callback)
+        return callback
+    def remove_alarm(self, handle):
+        self.alarms.remove(handle)
+
+# Stands in for the time module inside TypingPractice only, so urwid keeps the real clock
+class FakeClock:
+    def __init__(self):
+        self.ticks = []
+    def monotonic_ns(self):
+        if not self.ticks:
+            raise AssertionError("FakeClock ran out of scripted monotonic_ns ticks")
+        return self.ticks.pop(0)
+    def sleep(self, seconds): pass
+    def __getattr__(self, name):
+        return getattr(time, name)
+    def __enter__(self):
+        practice_module.time = self
+        return self
+    def __exit__(self, *exc_info):
+        practice_module.time = time
+
+def test_stamp_order():
+    screen = TimestampedScreen()
+    loop = MockEventLoop()
+    seen = []
+    callback = lambda keys, raw: seen.append((keys, screen.key_read_ns))
+
+    screen.read_ns = 111
+    screen.parse_input(loop, callback, [ord('a'), ord('b')])
+    screen.read_ns = 222
+    screen.parse_input(loop, callback, [ord('c')])
+
+    assert seen == [(['a', 'b'], 111), (['c'], 222)]
+    assert screen.key_read_ns is None
+
+def test_keys_consumed_by_widgets():
+    app = TypingPractice()
+    app.loop = MockLoop()
+    handled = []
+
+    # Stand-in for MainLoop._update: arrow keys go to widgets, the rest to unhandled_input
+    def update(keys, raw):
+        for key in keys:
+            if key not in ('up', 'down'):
+                handled.append((key, app.screen.key_read_ns))
+
+    app.screen.read_ns = 111
+    app.screen.parse_input(MockEventLoop(), update, [27, ord('['), ord('A')])
+    app.screen.read_ns = 222
+    app.screen.parse_input(MockEventLoop(), update, [ord('a')])
+
+    assert handled == [('a', 222)]
+
+    # Keys that never came through the raw display carry no stamp
+    app.current_char = 'a'
+    app.handle_input('a')
+    assert app.unstamped_count == 1
+    assert app.latency_count == 0
+
+def test_escape_timeout():
+    screen = TimestampedScreen()
+    loop = MockEventLoop()
+    seen = []
+    callback = lambda keys, raw: seen.append((keys, screen.key_read_ns))
+
+    screen.read_ns = 111
+    screen.parse_input(loop, callback, [27, ord('[')])
+    assert len(loop.alarms) == 1
+
+    # The timeout fires after a newer read; the sequence keeps its own stamp and is delivered once
+    screen.read_ns = 222
+    loop.alarms.pop()()
+
+    assert [keys for keys, read_ns in seen if keys] == [['meta [']]
+    assert seen[-1] == (['meta ['], 111)
+
+def test_reaction_and_latency():
+    with tempfile.TemporaryDirectory() as directory:
+        app = TypingPractice(session_dir=directory)
+        app.loop = MockLoop()
+        app.current_char = 'a'
+        app.target_shown_ns = 0
+
+        with FakeClock() as clock:
+            # Wrong at 500 ms, handled 10 ms later; the flash ends and the target is redrawn at 620 ms
+            app.screen.key_read_ns = 500 * MS
+            clock.ticks = [510 * MS]
+            app.handle_input('b')
+            assert app.flash_alarm is not None
+            clock.ticks = [620 * MS]
+            app.flash_alarm(app.loop, None)
+            assert app.target_shown_ns == 620 * MS
+            assert app.flash_alarm is None
+
+            # Correct at 800 ms: reaction counts from the redraw, not from the first showing
+            app.screen.key_read_ns = 800 * MS
+            clock.ticks = [805 * MS]
+            app.handle_input('a')
+
+            # Typed during the flash: it is read at once, but before the new target was shown
+            target = app.current_char = 'c'
+            app.screen.key_read_ns = 850 * MS
+            clock.ticks = [860 * MS, 870 * MS]
+            app.handle_input(target)
+            assert app.target_shown_ns == 870 * MS
+
+        assert app.reaction_ns == (500 + 180) * MS
+        assert app.reaction_count == 2
+        assert app.latency_ns == (10 + 5 + 10) * MS
+        assert app.latency_count == 3
+        assert app.early_count == 1
+        assert app.unstamped_count == 0
+
+        path = app.export_summary()
+        with open(path, encoding='utf-8') as f:
+            summary = json.load(f)
+
+    assert summary['reaction_ms'] == 340.0
+    assert summary['latency_ms'] == 8.333
+    assert summary['early_count'] == 1
+    assert summary['keys']['a']['reaction_ms'] == 340.0
+    assert summary['keys']['a']['latency_ms'] == 7.5
+    assert summary['keys'][target]['reaction_ms'] is None
+    assert summary['keys'][target]['latency_ms'] == 10.0
+
+def test_target_stamped_after_draw():
+    app = TypingPractice()
+    app.loop = MockLoop(app)
+    draws = []
+
+    with FakeClock() as clock:
+        # Record how many ticks are left at each draw, so a stamp taken after it is visible
+        app.loop.draw_screen = lambda: draws.append(len(clock.ticks))
+
+        # Start-up: run() takes no stamp itself, the zero-delay alarm stamps after the first draw
+        app.run()
+        clock.ticks = [100 * MS]
+        app.loop.alarms[0](app.loop, None)
+        assert draws == [1]
+        assert app.target_shown_ns == 100 * MS
+
+        # Mode switch: the reset stamp is replaced by one taken after the redraw
+        clock.ticks = [200 * MS, 300 * MS]
+        app.set_mode('zhuyin')
+        assert draws == [1, 1]
+        assert app.target_shown_ns == 300 * MS
+
+if __name__ == "__main__":
+    test_stamp_order()
+    test_keys_consumed_by_widgets()
+    test_escape_timeout()
+    test_reaction_and_latency()
+    test_target_stamped_after_draw()
+    print("Test finished successfully.")